@@ -0,0 +1,143 @@
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+
+PRIORITIES = ("high", "normal", "low")
+# "high" is reserved for admin callers, so it only needs a short queue
+DEFAULT_QUEUE_LIMITS = {"high": 4, "normal": 32, "low": 8}
+
+
+class AdmissionRejected(Exception):
+    """Raised when the queue for a priority is full"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Server is busy, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request's deadline passes before its work is done"""
+
+
+class ClientDisconnected(Exception):
+    """Raised when the client closes the connection before its response is ready"""
+
+
+class ReviewCancelled(Exception):
+    """Raised inside worker code once the request has been abandoned"""
+
+
+class RequestContext:
+    """Deadline and cancellation flag shared between the handler and the worker thread"""
+
+    def __init__(self, deadline: float):
+        self.deadline = deadline
+        self.cancelled = threading.Event()
+
+    def remaining(self) -> float:
+        return self.deadline - time.monotonic()
+
+    def check(self):
+        """Stop the worker if the client went away or the deadline has passed"""
+        if self.cancelled.is_set():
+            raise ReviewCancelled()
+        if self.remaining() <= 0:
+            raise DeadlineExceeded()
+
+
+class Ticket:
+    """A granted execution slot; release it exactly once when the work has stopped"""
+
+    def __init__(self, controller: "AdmissionController"):
+        self._controller = controller
+        self._started = time.monotonic()
+        self._released = False
+
+    def release(self, completed: bool = True):
+        if self._released:
+            return
+        self._released = True
+        self._controller._release(time.monotonic() - self._started if completed else None)
+
+
+class AdmissionController:
+    """Bounded per-priority queues in front of a fixed number of execution slots"""
+
+    def __init__(self, max_concurrency: int = 4, queue_limits: Optional[Dict[str, int]] = None,
+                 initial_service_time: float = 5.0, smoothing: float = 0.2):
+        self.max_concurrency = max_concurrency
+        self.queue_limits = dict(queue_limits or DEFAULT_QUEUE_LIMITS)
+        self.smoothing = smoothing
+        self.service_time = initial_service_time
+        self.running = 0
+        self._queues = {priority: deque() for priority in PRIORITIES}
+
+    def queued(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def service_rate(self) -> float:
+        """Measured completions per second across all slots"""
+        return self.max_concurrency / max(self.service_time, 1e-3)
+
+    def retry_after(self) -> int:
+        backlog = self.queued() + self.running
+        return max(1, math.ceil(backlog / self.service_rate()))
+
+    async def acquire(self, priority: str, deadline: float) -> Ticket:
+        """Wait for a slot, or raise AdmissionRejected/DeadlineExceeded"""
+        if priority not in self._queues:
+            priority = "normal"
+
+        if self.running < self.max_concurrency and not self.queued():
+            self.running += 1
+            return Ticket(self)
+
+        queue = self._queues[priority]
+        if len(queue) >= self.queue_limits.get(priority, 0):
+            raise AdmissionRejected(self.retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (waiter, deadline)
+        queue.append(entry)
+        try:
+            return await asyncio.wait_for(waiter, timeout=max(deadline - time.monotonic(), 0))
+        except asyncio.TimeoutError:
+            self._abandon(waiter)
+            raise DeadlineExceeded()
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        finally:
+            if entry in queue:
+                queue.remove(entry)
+
+    @staticmethod
+    def _abandon(waiter: asyncio.Future):
+        # A slot granted just as the caller gave up must be handed back
+        if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+            waiter.result().release(completed=False)
+
+    def _release(self, service_time: Optional[float]):
+        if service_time is not None:
+            self.service_time += self.smoothing * (service_time - self.service_time)
+        self.running -= 1
+        self._grant()
+
+    def _grant(self):
+        now = time.monotonic()
+        for priority in PRIORITIES:
+            queue = self._queues[priority]
+            while queue and self.running < self.max_concurrency:
+                waiter, deadline = queue.popleft()
+                if waiter.done():
+                    continue
+                if deadline <= now:
+                    # Running work that nobody will receive only lowers goodput
+                    waiter.set_exception(DeadlineExceeded())
+                    continue
+                self.running += 1
+                waiter.set_result(Ticket(self))
@@ -0,0 +1,354 @@
+import re
+from typing import Iterator, List, Optional, Set, Tuple
+
+
+MAX_LINE_LENGTH = 120
+INDENT_UNIT = "    "
+
+HASH_COMMENT_LANGUAGES = {'python', 'ruby', 'php'}
+SLASH_COMMENT_LANGUAGES = {
+    'javascript', 'typescript', 'java', 'cpp', 'c', 'csharp',
+    'go', 'rust', 'php', 'swift', 'kotlin'
+}
+TRIPLE_QUOTE_LANGUAGES = {'python', 'kotlin', 'swift'}
+BACKTICK_LANGUAGES = {'javascript', 'typescript', 'go'}
+VAR_LANGUAGES = {'javascript', 'typescript'}
+PREPROCESSOR_LANGUAGES = {'c', 'cpp', 'csharp'}
+REGEX_LITERAL_LANGUAGES = {'javascript', 'typescript'}
+
+REGEX_LITERAL = re.compile(r'/(?:\\.|\[(?:\\.|[^\]\\\n])*\]|[^/\\\[\n])+/[A-Za-z]*')
+REGEX_PRECEDING_KEYWORDS = {
+    'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+    'throw', 'case', 'do', 'else', 'yield', 'await'
+}
+
+# A 'var' is only rewritten when none of these make 'let' behave differently
+DECLARATION_KEYWORDS = {'var', 'let', 'const', 'function', 'class'}
+LOOP_KEYWORDS = {'for', 'while', 'do'}
+CONTINUATION_OPS = set('=+-*/%&|^!<>?:.')
+DYNAMIC_SCOPE_NAMES = {'eval', 'with'}
+
+OPEN_BRACKETS = '([{'
+CLOSE_BRACKETS = ')]}'
+
+# Issue titles produced by analyze_code_quality that this module can resolve
+FIX_VAR = "Deprecated Variable Declaration"
+FIX_INDENT = "Inconsistent Indentation"
+FIX_LONG_LINES = "Long Lines Detected"
+
+# Keyed by lexer style rather than language name, so client-supplied languages cannot grow it
+_lexer_cache = {}
+
+
+def _lexer_style(language: str) -> Tuple[bool, bool, bool, bool]:
+    """The comment and string syntax a language uses; unknown languages share the plain style"""
+    return (
+        language in SLASH_COMMENT_LANGUAGES,
+        language in HASH_COMMENT_LANGUAGES,
+        language in TRIPLE_QUOTE_LANGUAGES,
+        language in BACKTICK_LANGUAGES,
+    )
+
+
+def _build_lexer(style: Tuple[bool, bool, bool, bool]) -> re.Pattern:
+    """Build the master token regex for a comment and string style"""
+    slash_comments, hash_comments, triple_quotes, backticks = style
+    comments = []
+    if slash_comments:
+        comments += [r'//[^\n]*', r'/\*[\s\S]*?(?:\*/|$)']
+    if hash_comments:
+        comments.append(r'#[^\n]*')
+
+    strings = []
+    if triple_quotes:
+        strings += [r'"""[\s\S]*?(?:"""|$)', r"'''[\s\S]*?(?:'''|$)"]
+    if backticks:
+        strings.append(r'`(?:\\[\s\S]|[^`\\])*`?')
+    strings += [r'"(?:\\.|[^"\\\n])*"?', r"'(?:\\.|[^'\\\n])*'?"]
+
+    parts = [
+        r'(?P<newline>\r?\n)',
+        r'(?P<space>[ \t]+)',
+    ]
+    if comments:
+        parts.append(r'(?P<comment>' + '|'.join(comments) + r')')
+    parts += [
+        r'(?P<string>' + '|'.join(strings) + r')',
+        r'(?P<name>[A-Za-z_$][\w$]*)',
+        r'(?P<number>\d[\w.]*)',
+        r'(?P<op>[\s\S])',
+    ]
+    return re.compile('|'.join(parts))
+
+
+def _regex_allowed(previous: Optional[Tuple[str, str]]) -> bool:
+    """Whether a '/' after this significant token starts a regex literal rather than a division
+
+    Names, numbers, strings and closing brackets end an operand, so a '/' after them divides.
+    """
+    if previous is None:
+        return True
+    kind, text = previous
+    if kind == 'op':
+        return text not in CLOSE_BRACKETS
+    return kind == 'name' and text in REGEX_PRECEDING_KEYWORDS
+
+
+def tokenize(code: str, language: str) -> Iterator[Tuple[str, str]]:
+    """Split code into (kind, text) tokens; concatenating the texts gives back the input"""
+    style = _lexer_style(language)
+    lexer = _lexer_cache.get(style)
+    if lexer is None:
+        lexer = _lexer_cache[style] = _build_lexer(style)
+    regex_literals = language in REGEX_LITERAL_LANGUAGES
+
+    previous = None
+    position = 0
+    while position < len(code):
+        match = None
+        if (regex_literals and code[position] == '/' and code[position + 1:position + 2] not in ('/', '*')
+                and _regex_allowed(previous)):
+            match = REGEX_LITERAL.match(code, position)
+        if match is not None:
+            kind = 'regex'
+        else:
+            match = lexer.match(code, position)
+            kind = match.lastgroup
+        text = match.group()
+        yield kind, text
+        if kind not in ('newline', 'space', 'comment'):
+            previous = (kind, text)
+        position = match.end()
+
+
+def _wrap_line(tokens: List[Tuple[str, str]], depth: int, indent: str) -> Tuple[List[str], int]:
+    """Break an over-long line after commas that sit inside brackets"""
+    out = []
+    column = 0
+    last_break = None
+    continuation = indent + INDENT_UNIT
+
+    for kind, text in tokens:
+        if kind == 'op':
+            if text in OPEN_BRACKETS:
+                depth += 1
+            elif text in CLOSE_BRACKETS:
+                depth = max(0, depth - 1)
+
+        if column + len(text) > MAX_LINE_LENGTH and last_break is not None and kind != 'space':
+            out.insert(last_break, '\n' + continuation)
+            column = sum(len(t) for t in out[last_break + 1:]) + len(continuation)
+            if out[last_break + 1:] and out[last_break + 1].isspace():
+                column -= len(out.pop(last_break + 1))
+            last_break = None
+
+        out.append(text)
+        column += len(text)
+        if kind == 'op' and text == ',' and depth > 0 and column <= MAX_LINE_LENGTH:
+            last_break = len(out)
+
+    return out, depth
+
+
+def _starts_statement(previous: Optional[str]) -> bool:
+    return previous is None or previous in (';', '{', '}', 'async', 'export')
+
+
+def _safe_var_declarations(tokens: List[Tuple[str, str]]) -> Set[int]:
+    """Token indices of 'var' keywords that can become 'let' without changing behaviour
+
+    A declaration qualifies when it declares one plain name outside any loop, switch or
+    single-statement body, and every other use of that name comes after the declaration,
+    inside the same block and outside hoisted function declarations. Redeclarations,
+    use-before-declaration, closures over loop variables and reads after the block ends
+    all fail one of these checks and are left for the model.
+    """
+    significant = [(i, kind, text) for i, (kind, text) in enumerate(tokens)
+                   if kind not in ('newline', 'space', 'comment')]
+    line_break_before = []
+    last = -1
+    for i, _, _ in significant:
+        line_break_before.append(any(tokens[j][0] == 'newline' for j in range(last + 1, i)))
+        last = i
+
+    uses = {}
+    candidates = []
+    block_end = {}
+    blocks = []  # (position of '{', kind) for every open block
+    parens = []  # keyword before each open '('
+    closed_paren = None
+    pending_declaration = False
+    hoisted_depth = 0
+    hoisted_at = []
+
+    for p, (_, kind, text) in enumerate(significant):
+        previous = significant[p - 1][2] if p else None
+        if kind == 'name':
+            if previous != '.' and text in DYNAMIC_SCOPE_NAMES:
+                return set()
+            if text == 'function' and previous != '.' and _starts_statement(previous):
+                pending_declaration = True
+            if text == 'var' and previous != '.':
+                unsafe = (previous in (')', 'else', 'do', ':')
+                          or any(block_kind in ('loop', 'switch') for _, block_kind in blocks)
+                          or any(keyword in LOOP_KEYWORDS for keyword in parens))
+                if not unsafe:
+                    candidates.append((p, blocks[-1][0] if blocks else None))
+            uses.setdefault(text, []).append(p)
+            hoisted_at.append(hoisted_depth)
+            continue
+        hoisted_at.append(hoisted_depth)
+        if kind != 'op':
+            continue
+        if text == '(':
+            if pending_declaration:
+                parens.append('function')
+                pending_declaration = False
+            else:
+                parens.append(previous if p and significant[p - 1][1] == 'name' else None)
+        elif text == ')':
+            closed_paren = parens.pop() if parens else None
+        elif text == '{':
+            if previous == ')' and closed_paren in LOOP_KEYWORDS:
+                block_kind = 'loop'
+            elif previous == ')' and closed_paren == 'switch':
+                block_kind = 'switch'
+            elif previous == ')' and closed_paren == 'function':
+                block_kind = 'hoisted'
+                hoisted_depth += 1
+            elif previous == 'do':
+                block_kind = 'loop'
+            else:
+                block_kind = 'other'
+            blocks.append((p, block_kind))
+        elif text == '}' and blocks:
+            start, block_kind = blocks.pop()
+            block_end[start] = p
+            if block_kind == 'hoisted':
+                hoisted_depth -= 1
+
+    safe = set()
+    for p, block in candidates:
+        if p + 1 >= len(significant) or significant[p + 1][1] != 'name':
+            continue
+        name = significant[p + 1][2]
+        if name in DECLARATION_KEYWORDS:
+            continue
+        scope_end = block_end.get(block, len(significant)) if block is not None else len(significant)
+
+        # Find where the declaration ends; a second declarator makes it a multi-name statement
+        end = p + 2
+        depth = 0
+        single = True
+        while end < scope_end:
+            _, kind, text = significant[end]
+            if depth == 0 and line_break_before[end] and significant[end - 1][2] not in CONTINUATION_OPS:
+                break
+            if kind == 'op':
+                if text in OPEN_BRACKETS:
+                    depth += 1
+                elif text in CLOSE_BRACKETS:
+                    if depth == 0:
+                        break
+                    depth -= 1
+                elif depth == 0 and text == ';':
+                    break
+                elif depth == 0 and text == ',':
+                    single = False
+                    break
+            end += 1
+        if not single:
+            continue
+
+        ok = True
+        for q in uses[name]:
+            if q == p + 1:
+                continue
+            before = significant[q - 1][2]
+            if (q < end or q >= scope_end or before == '.' or before in DECLARATION_KEYWORDS
+                    or hoisted_at[q] > hoisted_at[p]):
+                ok = False
+                break
+        if ok:
+            safe.add(significant[p][0])
+    return safe
+
+
+def apply_local_fixes(code: str, language: str, issues: list) -> Tuple[str, List[str]]:
+    """Rewrite mechanical issues locally and return the fixed code with the titles it resolved"""
+    titles = {issue.title for issue in issues}
+    fix_var = FIX_VAR in titles and language in VAR_LANGUAGES
+    fix_indent = FIX_INDENT in titles
+    # Wrapping needs to know where comments are; elsewhere the model handles long lines
+    fix_long = FIX_LONG_LINES in titles and (language in SLASH_COMMENT_LANGUAGES or language in HASH_COMMENT_LANGUAGES)
+    if not (fix_var or fix_indent or fix_long):
+        return code, []
+
+    out = []
+    line = []
+    depth = 0
+    previous = None
+    at_line_start = True
+    continued_directive = False
+
+    def flush():
+        nonlocal depth, continued_directive
+        if not line:
+            continued_directive = False
+            return
+        text = ''.join(t for _, t in line)
+        # A newline inside a preprocessor directive or its continuation lines would break it
+        directive = continued_directive or (
+            language in PREPROCESSOR_LANGUAGES and [t for k, t in line if k != 'space'][:1] == ['#'])
+        continued_directive = directive and text.rstrip().endswith('\\')
+        if directive:
+            out.append(text)
+        elif fix_long and len(text) > MAX_LINE_LENGTH and not any('\n' in t for _, t in line):
+            indent = line[0][1] if line[0][0] == 'space' else ''
+            wrapped, depth = _wrap_line(line, depth, indent)
+            out.extend(wrapped)
+        else:
+            for kind, t in line:
+                if kind == 'op':
+                    if t in OPEN_BRACKETS:
+                        depth += 1
+                    elif t in CLOSE_BRACKETS:
+                        depth = max(0, depth - 1)
+            out.append(text)
+        line.clear()
+
+    tokens = list(tokenize(code, language))
+    safe_vars = _safe_var_declarations(tokens) if fix_var else set()
+    kept_var = False
+
+    for index, (kind, text) in enumerate(tokens):
+        if kind == 'newline':
+            flush()
+            out.append(text)
+            at_line_start = True
+            continue
+
+        if kind == 'space' and fix_indent and '\t' in text:
+            text = text.expandtabs(len(INDENT_UNIT)) if at_line_start else ' '
+        elif kind == 'name' and fix_var and text == 'var' and previous != '.':
+            if index in safe_vars:
+                text = 'let'
+            else:
+                kept_var = True
+
+        line.append((kind, text))
+        if kind != 'space':
+            previous = text
+        at_line_start = False
+    flush()
+
+    fixed = ''.join(out)
+    resolved = []
+    # Leftover tabs can only be inside strings and comments, which are not code issues
+    if fix_var and not kept_var:
+        resolved.append(FIX_VAR)
+    if fix_indent:
+        resolved.append(FIX_INDENT)
+    if fix_long and all(len(l) <= MAX_LINE_LENGTH for l in fixed.split('\n')):
+        resolved.append(FIX_LONG_LINES)
+    return fixed, resolved
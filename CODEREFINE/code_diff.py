@@ -0,0 +1,190 @@
+import re
+from typing import List, NamedTuple
+
+
+MAX_EDIT_DISTANCE = 2000
+CONTEXT_LINES = 3
+
+DECISION_POINTS = re.compile(r'\b(?:if|elif|else\s+if|for|foreach|while|case|catch|except|and|or)\b|&&|\|\||\?(?![.?])')
+
+
+def split_lines(text: str) -> List[str]:
+    """Split after each newline only, keeping line endings, the way clients and patch count lines
+
+    str.splitlines also breaks on form feeds, '\\x1c'-'\\x1e', '\\x85' and '\\u2028', which shifts line numbers.
+    """
+    return [line for line in re.split(r'(?<=\n)', text) if line]
+
+
+class Opcode(NamedTuple):
+    tag: str
+    i1: int
+    i2: int
+    j1: int
+    j2: int
+
+
+def _myers(a: List[int], b: List[int]) -> List[Opcode]:
+    """Shortest edit script between two id sequences (Myers O(ND))"""
+    n, m = len(a), len(b)
+    offset = n + m + 1
+    v = [0] * (2 * offset + 1)
+    trace = []
+
+    for d in range(min(n + m, MAX_EDIT_DISTANCE) + 1):
+        trace.append(v[offset - d:offset + d + 1])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return _backtrack(trace, n, m)
+
+    return [Opcode('replace', 0, n, 0, m)]
+
+
+def _backtrack(trace: List[List[int]], n: int, m: int) -> List[Opcode]:
+    moves = []
+    x, y = n, m
+    for d in range(len(trace) - 1, 0, -1):
+        previous = trace[d]
+        k = x - y
+        if k == -d or (k != d and previous[k - 1 + d] < previous[k + 1 + d]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = previous[prev_k + d]
+        prev_y = prev_x - prev_k
+        while x > prev_x and y > prev_y:
+            x -= 1
+            y -= 1
+            moves.append(('equal', x, y))
+        if x == prev_x:
+            moves.append(('insert', x, prev_y))
+        else:
+            moves.append(('delete', prev_x, y))
+        x, y = prev_x, prev_y
+    while x > 0 and y > 0:
+        x -= 1
+        y -= 1
+        moves.append(('equal', x, y))
+    moves.reverse()
+
+    opcodes = []
+    for tag, x, y in moves:
+        if tag == 'equal':
+            if opcodes and opcodes[-1].tag == 'equal':
+                opcodes[-1] = opcodes[-1]._replace(i2=x + 1, j2=y + 1)
+            else:
+                opcodes.append(Opcode('equal', x, x + 1, y, y + 1))
+        else:
+            step_i, step_j = (1, 0) if tag == 'delete' else (0, 1)
+            if opcodes and opcodes[-1].tag != 'equal':
+                last = opcodes[-1]
+                opcodes[-1] = Opcode('replace', last.i1, last.i2 + step_i, last.j1, last.j2 + step_j)
+            else:
+                opcodes.append(Opcode('replace', x, x + step_i, y, y + step_j))
+    return [op._replace(tag='delete') if op.tag == 'replace' and op.j1 == op.j2
+            else op._replace(tag='insert') if op.tag == 'replace' and op.i1 == op.i2
+            else op for op in opcodes]
+
+
+def diff_lines(original: List[str], optimized: List[str]) -> List[Opcode]:
+    """Line-level opcodes in the same shape as difflib.SequenceMatcher.get_opcodes()"""
+    prefix = 0
+    limit = min(len(original), len(optimized))
+    while prefix < limit and original[prefix] == optimized[prefix]:
+        prefix += 1
+    suffix = 0
+    while (suffix < limit - prefix
+           and original[len(original) - 1 - suffix] == optimized[len(optimized) - 1 - suffix]):
+        suffix += 1
+
+    ids = {}
+    a = [ids.setdefault(line, len(ids)) for line in original[prefix:len(original) - suffix]]
+    b = [ids.setdefault(line, len(ids)) for line in optimized[prefix:len(optimized) - suffix]]
+
+    opcodes = []
+    if prefix:
+        opcodes.append(Opcode('equal', 0, prefix, 0, prefix))
+    if a or b:
+        for op in _myers(a, b):
+            opcodes.append(Opcode(op.tag, op.i1 + prefix, op.i2 + prefix, op.j1 + prefix, op.j2 + prefix))
+    if suffix:
+        opcodes.append(Opcode('equal', len(original) - suffix, len(original),
+                              len(optimized) - suffix, len(optimized)))
+    return opcodes
+
+
+def _hunk_range(start: int, length: int) -> str:
+    if length == 1:
+        return f"{start + 1}"
+    return f"{start + 1 if length else start},{length}"
+
+
+def unified_diff(original: List[str], optimized: List[str], opcodes: List[Opcode],
+                 context: int = CONTEXT_LINES) -> str:
+    """Render opcodes over keepends lines as a unified diff"""
+    changes = [op for op in opcodes if op.tag != 'equal']
+    if not changes:
+        return ""
+
+    groups = [[changes[0]]]
+    for op in changes[1:]:
+        if op.i1 - groups[-1][-1].i2 <= 2 * context:
+            groups[-1].append(op)
+        else:
+            groups.append([op])
+
+    out = ["--- original\n", "+++ optimized\n"]
+    for group in groups:
+        i1 = max(group[0].i1 - context, 0)
+        i2 = min(group[-1].i2 + context, len(original))
+        j1 = group[0].j1 - (group[0].i1 - i1)
+        j2 = group[-1].j2 + (i2 - group[-1].i2)
+        out.append(f"@@ -{_hunk_range(i1, i2 - i1)} +{_hunk_range(j1, j2 - j1)} @@\n")
+
+        position = i1
+        for op in group:
+            out.extend(' ' + line for line in original[position:op.i1])
+            out.extend('-' + line for line in original[op.i1:op.i2])
+            out.extend('+' + line for line in optimized[op.j1:op.j2])
+            position = op.i2
+        out.extend(' ' + line for line in original[position:i2])
+
+    return ''.join(line if line.endswith('\n') else line + "\n\\ No newline at end of file\n" for line in out)
+
+
+def edit_list(optimized: List[str], opcodes: List[Opcode]) -> List[dict]:
+    """Structured edits: replace removed_lines lines starting at start_line (1-based) with replacement"""
+    return [
+        {
+            "start_line": op.i1 + 1,
+            "removed_lines": op.i2 - op.i1,
+            "replacement": ''.join(optimized[op.j1:op.j2])
+        }
+        for op in opcodes if op.tag != 'equal'
+    ]
+
+
+def _line_weight(line: str) -> int:
+    if not line.strip():
+        return 0
+    return 1 + len(DECISION_POINTS.findall(line))
+
+
+def complexity_reduction(original: List[str], optimized: List[str], opcodes: List[Opcode]) -> str:
+    """Share of the original's line-plus-branch weight removed by the edit"""
+    total = sum(_line_weight(line) for line in original)
+    if not total:
+        return "0%"
+    removed = sum(_line_weight(line) for op in opcodes if op.tag != 'equal' for line in original[op.i1:op.i2])
+    added = sum(_line_weight(line) for op in opcodes if op.tag != 'equal' for line in optimized[op.j1:op.j2])
+    reduction = max(0, (removed - added) / total * 100)
+    return f"{reduction:.1f}%"
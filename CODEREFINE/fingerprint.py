@@ -0,0 +1,334 @@
+import gzip
+import json
+import os
+import threading
+import zlib
+from collections import OrderedDict, deque
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from autofix import tokenize
+from code_diff import split_lines
+
+
+DEFAULT_K = 25
+DEFAULT_WINDOW = 8
+MIN_REGION_LINES = 5
+MAX_LINE_DRIFT = 1
+DEFAULT_MAX_RESULT_BYTES = 32 * 1024 * 1024
+
+_MOD = (1 << 61) - 1
+_BASE = 1000003
+
+# Keywords survive normalization so that structure still distinguishes blocks
+KEYWORDS = {
+    'if', 'else', 'elif', 'for', 'while', 'do', 'switch', 'case', 'break', 'continue', 'return', 'try',
+    'catch', 'except', 'finally', 'throw', 'raise', 'def', 'function', 'func', 'fn', 'fun', 'class',
+    'struct', 'interface', 'import', 'from', 'new', 'in', 'not', 'and', 'or', 'with', 'yield', 'await',
+    'async', 'lambda', 'end', 'match',
+}
+
+
+class Fingerprint(NamedTuple):
+    hash: int
+    start_line: int
+    end_line: int
+
+
+class DuplicateRegion(NamedTuple):
+    start_line: int
+    end_line: int
+    other_document: Optional[str]
+    other_start_line: int
+    other_end_line: int
+
+
+def normalize_tokens(code: str, language: str) -> List[Tuple[int, int]]:
+    """Return (token hash, line) pairs with identifiers, literals and layout abstracted away"""
+    tokens = []
+    line = 1
+    for kind, text in tokenize(code, language):
+        if kind == 'newline':
+            line += 1
+            continue
+        if kind == 'space':
+            continue
+        if kind in ('comment', 'string', 'regex'):
+            line += text.count('\n')
+            if kind != 'comment':
+                tokens.append((zlib.crc32(b'S'), line))
+            continue
+        if kind == 'name':
+            value = text if text in KEYWORDS else 'N'
+        elif kind == 'number':
+            value = '0'
+        else:
+            value = text
+        tokens.append((zlib.crc32(value.encode()), line))
+    return tokens
+
+
+def winnow(tokens: List[Tuple[int, int]], k: int = DEFAULT_K, window: int = DEFAULT_WINDOW) -> List[Fingerprint]:
+    """Select fingerprints from k-gram rolling hashes with the winnowing algorithm"""
+    if len(tokens) < k:
+        return []
+
+    high = pow(_BASE, k - 1, _MOD)
+    grams = []
+    value = 0
+    for index, (token, _) in enumerate(tokens):
+        if index >= k:
+            value = (value - tokens[index - k][0] * high) % _MOD
+        value = (value * _BASE + token) % _MOD
+        if index >= k - 1:
+            grams.append(value)
+
+    selected = []
+    candidates = deque()
+    last = -1
+    for index, value in enumerate(grams):
+        while candidates and grams[candidates[-1]] >= value:
+            candidates.pop()
+        candidates.append(index)
+        if candidates[0] <= index - window:
+            candidates.popleft()
+        if index >= window - 1 and candidates[0] != last:
+            last = candidates[0]
+            selected.append(Fingerprint(grams[last], tokens[last][1], tokens[last + k - 1][1]))
+    if not selected and grams:
+        best = min(range(len(grams)), key=grams.__getitem__)
+        selected.append(Fingerprint(grams[best], tokens[best][1], tokens[best + k - 1][1]))
+    return selected
+
+
+def _merge(pairs: List[Tuple[Fingerprint, Tuple[int, int]]], other: Optional[str]) -> List[DuplicateRegion]:
+    """Join matched fingerprints into regions that advance on both sides at the same line offset"""
+    regions = []
+    counts = []
+    for own, (other_start, other_end) in sorted(pairs, key=lambda pair: (pair[0].start_line, pair[1][0])):
+        offset = own.start_line - other_start
+        for index in range(len(regions) - 1, -1, -1):
+            region = regions[index]
+            if (own.start_line <= region.end_line + 1
+                    and abs(offset - (region.start_line - region.other_start_line)) <= MAX_LINE_DRIFT
+                    and region.other_start_line <= other_start <= region.other_end_line + 1):
+                regions[index] = region._replace(
+                    end_line=max(region.end_line, own.end_line),
+                    other_end_line=max(region.other_end_line, other_end),
+                )
+                counts[index] += 1
+                break
+        else:
+            regions.append(DuplicateRegion(own.start_line, own.end_line, other, other_start, other_end))
+            counts.append(1)
+
+    # Where candidate regions claim the same lines, the one backed by most fingerprints wins
+    kept = []
+    for count, region in sorted(zip(counts, regions), key=lambda item: -item[0]):
+        if region.end_line - region.start_line + 1 < MIN_REGION_LINES:
+            continue
+        # Within one submission, a region that overlaps its own copy is a run of repeated lines
+        if other is None and region.other_end_line >= region.start_line:
+            continue
+        if any(region.start_line <= k.end_line and k.start_line <= region.end_line for k in kept):
+            continue
+        kept.append(region)
+    return kept
+
+
+def line_hashes(lines: List[str]) -> List[int]:
+    """Per-line hashes that ignore trailing whitespace and line endings"""
+    return [zlib.crc32(line.rstrip().encode("utf-8")) for line in lines]
+
+
+def _cover(hashes: List[int], regions: List[DuplicateRegion],
+           results: Dict[str, dict]) -> List[Optional[Tuple[str, int]]]:
+    """Map each line to an identical line of an earlier reviewed submission, growing regions over exact matches"""
+    cover = [None] * len(hashes)
+    for region in regions:
+        result = results.get(region.other_document)
+        if result is None:
+            continue
+        other_hashes = result["line_hashes"]
+        offset = region.other_start_line - region.start_line
+
+        start, end = region.start_line - 1, region.end_line
+        while start > 0 and start + offset > 0 and hashes[start - 1] == other_hashes[start - 1 + offset]:
+            start -= 1
+        while (end < len(hashes) and end + offset < len(other_hashes)
+               and hashes[end] == other_hashes[end + offset]):
+            end += 1
+
+        for i in range(start, end):
+            j = i + offset
+            if cover[i] is None and 0 <= j < len(other_hashes) and hashes[i] == other_hashes[j]:
+                cover[i] = (region.other_document, j)
+    return cover
+
+
+def splice_results(lines: List[str], regions: List[DuplicateRegion],
+                   results: Dict[str, dict]) -> Optional[Tuple[str, List[str]]]:
+    """Rebuild optimized code from earlier reviews whose code matches every non-blank line
+
+    Returns the optimized code and the reused document ids, or None when some line is new
+    or an earlier edit crosses the edge of a matching run.
+    """
+    cover = _cover(line_hashes(lines), regions, results)
+    if any(c is None and line.strip() for c, line in zip(cover, lines)):
+        return None
+
+    out = []
+    used = []
+    i = 0
+    while i < len(lines):
+        if cover[i] is None:
+            out.append(lines[i])
+            i += 1
+            continue
+        document, first = cover[i]
+        end = i + 1
+        while end < len(lines) and cover[end] == (document, first + end - i):
+            end += 1
+        last = first + end - i
+
+        result = results[document]
+        optimized = split_lines(result["optimized_code"])
+        position = first
+        at_end = last == len(result["line_hashes"])
+        for _, i1, i2, j1, j2 in result["edits"]:
+            if i1 == i2:
+                touches = first <= i1 < last or (at_end and i1 == last)
+            else:
+                touches = i1 < last and i2 > first
+            if not touches:
+                continue
+            if i1 < first or i2 > last:
+                return None
+            out.extend(lines[i + position - first:i + i1 - first])
+            out.extend(optimized[j1:j2])
+            position = i2
+        out.extend(lines[i + position - first:end])
+
+        if document not in used:
+            used.append(document)
+        i = end
+
+    code = ''.join(line if line.endswith('\n') or n == len(out) - 1 else line + '\n' for n, line in enumerate(out))
+    return code, used
+
+
+class FingerprintIndex:
+    """Bounded, persistable map from winnowed fingerprints to the submissions that contain them"""
+
+    def __init__(self, max_documents: int = 1000, max_fingerprints: int = 200000,
+                 max_result_bytes: int = DEFAULT_MAX_RESULT_BYTES):
+        self.max_documents = max_documents
+        self.max_fingerprints = max_fingerprints
+        self.max_result_bytes = max_result_bytes
+        self._postings: Dict[int, Dict[str, Tuple[int, int]]] = {}
+        self._documents: "OrderedDict[str, List[Fingerprint]]" = OrderedDict()
+        self._results: "OrderedDict[str, Tuple[dict, int]]" = OrderedDict()
+        self._size = 0
+        self._result_bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def find_duplicates(self, document_id: str, fingerprints: List[Fingerprint]) -> List[DuplicateRegion]:
+        """Find regions repeated inside this submission or shared with indexed submissions"""
+        internal = []
+        seen: Dict[int, List[Fingerprint]] = {}
+        external: Dict[str, list] = {}
+        with self._lock:
+            for fp in fingerprints:
+                # Pair with the closest earlier occurrence; overlapping ones mean a run of repeated lines
+                occurrences = seen.setdefault(fp.hash, [])
+                if occurrences and occurrences[-1].end_line < fp.start_line:
+                    earlier = occurrences[-1]
+                    internal.append((fp, (earlier.start_line, earlier.end_line)))
+                occurrences.append(fp)
+                for other, lines in self._postings.get(fp.hash, {}).items():
+                    if other != document_id:
+                        external.setdefault(other, []).append((fp, lines))
+
+        regions = _merge(internal, None)
+        for other, pairs in external.items():
+            regions.extend(_merge(pairs, other))
+        return sorted(regions, key=lambda r: (r.start_line, r.end_line, r.other_document or ""))
+
+    def add(self, document_id: str, fingerprints: List[Fingerprint]):
+        """Index a submission, evicting the oldest ones beyond the configured bounds"""
+        with self._lock:
+            if document_id in self._documents:
+                self._documents.move_to_end(document_id)
+                return
+            self._documents[document_id] = fingerprints
+            for fp in fingerprints:
+                postings = self._postings.setdefault(fp.hash, {})
+                if document_id not in postings:
+                    postings[document_id] = (fp.start_line, fp.end_line)
+                    self._size += 1
+            while len(self._documents) > 1 and (
+                    len(self._documents) > self.max_documents or self._size > self.max_fingerprints):
+                self._evict()
+
+    def _evict(self):
+        document_id, fingerprints = self._documents.popitem(last=False)
+        self._drop_result(document_id)
+        for fp in fingerprints:
+            postings = self._postings.get(fp.hash)
+            if postings and postings.pop(document_id, None) is not None:
+                self._size -= 1
+                if not postings:
+                    del self._postings[fp.hash]
+
+    def get_result(self, document_id: str) -> Optional[dict]:
+        with self._lock:
+            stored = self._results.get(document_id)
+            return stored[0] if stored else None
+
+    def store_result(self, document_id: str, result: dict):
+        """Keep a review result, dropping the oldest results beyond the byte budget"""
+        # Results hold whole files, so they are bounded by their encoded size, not by count
+        size = len(json.dumps(result, separators=(",", ":")))
+        with self._lock:
+            if document_id in self._documents:
+                self._drop_result(document_id)
+                if size > self.max_result_bytes:
+                    return
+                self._results[document_id] = (result, size)
+                self._result_bytes += size
+                while self._result_bytes > self.max_result_bytes:
+                    self._drop_result(next(iter(self._results)))
+
+    def _drop_result(self, document_id: str):
+        stored = self._results.pop(document_id, None)
+        if stored is not None:
+            self._result_bytes -= stored[1]
+
+    def save(self, path: str):
+        """Write the index to a gzipped JSON file, replacing it atomically"""
+        with self._lock:
+            data = {
+                "max_documents": self.max_documents,
+                "max_fingerprints": self.max_fingerprints,
+                "max_result_bytes": self.max_result_bytes,
+                "documents": [[doc, [list(fp) for fp in fps]] for doc, fps in self._documents.items()],
+                "results": {doc: result for doc, (result, _) in self._results.items()},
+            }
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "FingerprintIndex":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        index = cls(data["max_documents"], data["max_fingerprints"],
+                    data.get("max_result_bytes", DEFAULT_MAX_RESULT_BYTES))
+        for document_id, fingerprints in data["documents"]:
+            index.add(document_id, [Fingerprint(*fp) for fp in fingerprints])
+        for document_id, result in data["results"].items():
+            index.store_result(document_id, result)
+        return index
@@ -0,0 +1,136 @@
+import cProfile
+import marshal
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Callable, NamedTuple, Optional, Tuple
+
+
+PROFILE_FORMATS = ("collapsed", "pstats")
+SAMPLE_INTERVAL = 0.005
+MAX_STORED_PROFILES = 50
+
+
+class CapturedProfile(NamedTuple):
+    id: str
+    format: str
+    created: float
+    duration_ms: float
+    data: bytes
+
+
+class StackSampler:
+    """Periodically records the call stack of one thread as flamegraph-compatible collapsed stacks"""
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack and not self._stop.is_set():
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def collapsed(self) -> bytes:
+        return ''.join(f"{stack} {count}\n" for stack, count in self.samples.most_common()).encode("utf-8")
+
+
+class Profiler:
+    """Opt-in profiling of review work; a single attribute check when nothing is enabled"""
+
+    def __init__(self):
+        self.sample_rate = 0.0
+        self.format = "collapsed"
+        self._profiles: "OrderedDict[str, CapturedProfile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(self, sample_rate: float, format: str):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0 and 1")
+        if format not in PROFILE_FORMATS:
+            raise ValueError(f"format must be one of: {', '.join(PROFILE_FORMATS)}")
+        self.sample_rate = sample_rate
+        self.format = format
+
+    def choose(self, requested: Optional[str] = None) -> Optional[str]:
+        """Return the profile format for this request, or None to run it unprofiled"""
+        if requested:
+            return requested if requested in PROFILE_FORMATS else self.format
+        if self.sample_rate and random.random() < self.sample_rate:
+            return self.format
+        return None
+
+    def run(self, format: Optional[str], func: Callable, *args) -> Tuple[object, Optional[str]]:
+        """Call func in the current thread, capturing a profile when a format is given"""
+        if format is None:
+            return func(*args), None
+
+        started = time.perf_counter()
+        if format == "pstats":
+            profile = cProfile.Profile()
+            try:
+                result = profile.runcall(func, *args)
+            finally:
+                profile.create_stats()
+                data = marshal.dumps(profile.stats)
+                profile_id = self._store(format, started, data)
+        else:
+            sampler = StackSampler(threading.get_ident())
+            sampler.start()
+            try:
+                result = func(*args)
+            finally:
+                sampler.stop()
+                profile_id = self._store(format, started, sampler.collapsed())
+        return result, profile_id
+
+    def _store(self, format: str, started: float, data: bytes) -> str:
+        captured = CapturedProfile(
+            id=uuid.uuid4().hex,
+            format=format,
+            created=time.time(),
+            duration_ms=(time.perf_counter() - started) * 1000,
+            data=data,
+        )
+        with self._lock:
+            self._profiles[captured.id] = captured
+            while len(self._profiles) > MAX_STORED_PROFILES:
+                self._profiles.popitem(last=False)
+        return captured.id
+
+    def get(self, profile_id: str) -> Optional[CapturedProfile]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def list(self) -> list:
+        with self._lock:
+            return [
+                {
+                    "id": p.id,
+                    "format": p.format,
+                    "created": p.created,
+                    "duration_ms": round(p.duration_ms, 2),
+                    "size": len(p.data)
+                }
+                for p in reversed(self._profiles.values())
+            ]
@@ -0,0 +1,207 @@
+import math
+import re
+from bisect import bisect_right
+from collections import Counter, deque
+from typing import Dict, List, NamedTuple, Tuple
+
+
+class SecretRule(NamedTuple):
+    name: str
+    literals: Tuple[str, ...]
+    pattern: re.Pattern
+    entropy: bool = False
+
+
+class SecretFinding(NamedTuple):
+    rule: str
+    start: int
+    end: int
+    line: int
+    preview: str
+
+
+_B = r'(?<![A-Za-z0-9_\-])'
+
+# Values shorter than this are previewed by length only, never by their characters
+MIN_PREVIEW_LENGTH = 16
+
+# ASCII-only lowering keeps offsets in the lowered text aligned with the original
+_ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+# Ordered by priority: when two findings overlap, the earlier rule wins
+SECRET_RULES = [
+    SecretRule("Private Key", ("-----begin",),
+               re.compile(r'-----BEGIN (?:RSA |EC |DSA |OPENSSH |PGP |ENCRYPTED )?PRIVATE KEY(?: BLOCK)?-----')),
+    SecretRule("AWS Access Key ID", ("akia", "asia", "agpa", "aida", "aroa", "anpa", "anva", "aipa"),
+               re.compile(_B + r'(?:AKIA|ASIA|AGPA|AIDA|AROA|ANPA|ANVA|AIPA)[0-9A-Z]{16}(?![0-9A-Za-z])')),
+    SecretRule("AWS Secret Access Key", ("aws_secret",),
+               re.compile(r'aws_secret(?:_access)?_key["\']?\s*[:=]\s*["\']?[A-Za-z0-9/+=]{40}(?![A-Za-z0-9/+=])',
+                          re.IGNORECASE)),
+    SecretRule("Google API Key", ("aiza",), re.compile(_B + r'AIza[0-9A-Za-z_\-]{35}')),
+    SecretRule("Google OAuth Client Secret", ("gocspx-",), re.compile(r'GOCSPX-[0-9A-Za-z_\-]{28}')),
+    SecretRule("GitHub Token", ("ghp_", "gho_", "ghu_", "ghs_", "ghr_"),
+               re.compile(_B + r'gh[pousr]_[0-9A-Za-z]{36}')),
+    SecretRule("GitHub Fine-Grained Token", ("github_pat_",), re.compile(r'github_pat_[0-9A-Za-z_]{82}')),
+    SecretRule("GitLab Personal Access Token", ("glpat-",), re.compile(r'glpat-[0-9A-Za-z_\-]{20}')),
+    SecretRule("Slack Token", ("xoxb-", "xoxp-", "xoxa-", "xoxr-", "xoxs-"),
+               re.compile(r'xox[baprs]-[0-9A-Za-z\-]{10,}')),
+    SecretRule("Slack Webhook", ("hooks.slack.com/services/",),
+               re.compile(r'hooks\.slack\.com/services/T[0-9A-Z]+/B[0-9A-Z]+/[0-9A-Za-z]+')),
+    SecretRule("Discord Webhook", ("discord.com/api/webhooks/", "discordapp.com/api/webhooks/"),
+               re.compile(r'discord(?:app)?\.com/api/webhooks/[0-9]+/[0-9A-Za-z_\-]+')),
+    SecretRule("Stripe API Key", ("sk_live_", "rk_live_", "sk_test_", "rk_test_"),
+               re.compile(_B + r'[sr]k_(?:live|test)_[0-9A-Za-z]{24,}')),
+    SecretRule("SendGrid API Key", ("sg.",), re.compile(_B + r'SG\.[0-9A-Za-z_\-]{22}\.[0-9A-Za-z_\-]{43}')),
+    SecretRule("Mailgun API Key", ("key-",), re.compile(_B + r'key-[0-9a-z]{32}(?![0-9a-z])')),
+    SecretRule("npm Access Token", ("npm_",), re.compile(_B + r'npm_[0-9A-Za-z]{36}')),
+    SecretRule("PyPI Upload Token", ("pypi-ageichlwas5vcmc",),
+               re.compile(r'pypi-AgEIcHlwaS5vcmc[0-9A-Za-z_\-]{50,}')),
+    SecretRule("Anthropic API Key", ("sk-ant-",), re.compile(_B + r'sk-ant-[A-Za-z0-9_\-]{32,}')),
+    SecretRule("OpenAI API Key", ("sk-",), re.compile(_B + r'sk-(?:proj-)?[A-Za-z0-9_\-]{32,}')),
+    SecretRule("Hugging Face Token", ("hf_",), re.compile(_B + r'hf_[A-Za-z0-9]{34}')),
+    SecretRule("Shopify Token", ("shpat_", "shpss_", "shpca_", "shppa_"),
+               re.compile(r'shp(?:at|ss|ca|pa)_[a-fA-F0-9]{32}')),
+    SecretRule("Square Token", ("sq0atp-", "sq0csp-"), re.compile(r'sq0(?:atp|csp)-[0-9A-Za-z_\-]{22,43}')),
+    SecretRule("DigitalOcean Token", ("dop_v1_", "doo_v1_", "dor_v1_"), re.compile(r'do[opr]_v1_[a-f0-9]{64}')),
+    SecretRule("Linear API Key", ("lin_api_",), re.compile(r'lin_api_[A-Za-z0-9]{40}')),
+    SecretRule("Databricks Token", ("dapi",), re.compile(_B + r'dapi[a-f0-9]{32}(?:-\d)?')),
+    SecretRule("Postman API Key", ("pmak-",), re.compile(r'PMAK-[a-f0-9]{24}-[a-f0-9]{34}')),
+    SecretRule("Dynatrace Token", ("dt0c01.",), re.compile(r'dt0c01\.[A-Z0-9]{24}\.[A-Z0-9]{64}')),
+    SecretRule("New Relic API Key", ("nrak-",), re.compile(r'NRAK-[A-Z0-9]{27}')),
+    SecretRule("Grafana Token", ("glc_", "glsa_"), re.compile(_B + r'(?:glc_[A-Za-z0-9+/]{32,}=*|glsa_[A-Za-z0-9]{32}_[a-f0-9]{8})')),
+    SecretRule("Pulumi Access Token", ("pul-",), re.compile(_B + r'pul-[a-f0-9]{40}')),
+    SecretRule("Age Secret Key", ("age-secret-key-1",), re.compile(r'AGE-SECRET-KEY-1[QPZRY9X8GF2TVDW0S3JN54KHCE6MUA7L]{58}')),
+    SecretRule("Azure Storage Account Key", ("accountkey=",), re.compile(r'AccountKey=[A-Za-z0-9+/=]{86,88}')),
+    SecretRule("JSON Web Token", ("eyj",),
+               re.compile(_B + r'eyJ[A-Za-z0-9_\-]{10,}\.eyJ[A-Za-z0-9_\-]{10,}\.[A-Za-z0-9_\-]{10,}')),
+    SecretRule("Database URL With Password",
+               ("postgres://", "postgresql://", "mysql://", "mongodb://", "mongodb+srv://", "redis://", "amqp://",
+                "mssql://"),
+               re.compile(r'(?:postgres(?:ql)?|mysql|mongodb(?:\+srv)?|redis|amqp|mssql)://[^\s:/@"\']*:[^\s/@"\']+@',
+                          re.IGNORECASE)),
+    SecretRule("Hardcoded Credential",
+               ("password", "passwd", "secret", "api_key", "apikey", "api-key", "access_token", "auth_token",
+                "token", "private_key", "client_secret"),
+               re.compile(r'(?<![A-Za-z0-9])(?:password|passwd|secret|api_key|apikey|api-key|access_token|auth_token'
+                          r'|token|private_key|client_secret)(?:[_\-]?(?:key|secret|token))?(?![A-Za-z0-9_\-])'
+                          r'["\']?\s*(?::=|=>|=|:)\s*(["\'`])(?![$<{%])([^"\'`\s]{4,})\1', re.IGNORECASE)),
+    SecretRule("High-Entropy String", ('"', "'", '`'),
+               re.compile(r'(["\'`])([A-Za-z0-9+/=_\-]{20,})\1'), entropy=True),
+]
+
+
+class AhoCorasick:
+    """Multi-literal automaton that reports every literal occurrence in one pass over the text"""
+
+    def __init__(self, literals: Dict[str, List[int]]):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+
+        for literal, values in literals.items():
+            state = 0
+            for char in literal:
+                nxt = self.goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][char] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = nxt
+            self.output[state].extend((len(literal), value) for value in values)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[nxt] = target if target != nxt else 0
+                self.output[nxt] = self.output[nxt] + self.output[self.fail[nxt]]
+
+    def iter(self, text: str):
+        """Yield (start, value) for every literal occurrence"""
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, value in output[state]:
+                yield index - length + 1, value
+
+
+def _build_automaton() -> AhoCorasick:
+    literals = {}
+    for rule_index, rule in enumerate(SECRET_RULES):
+        for literal in rule.literals:
+            literals.setdefault(literal.lower(), []).append(rule_index)
+    return AhoCorasick(literals)
+
+
+_automaton = _build_automaton()
+
+
+def shannon_entropy(value: str) -> float:
+    """Bits of entropy per character"""
+    length = len(value)
+    return -sum(count / length * math.log2(count / length) for count in Counter(value).values())
+
+
+def _looks_random(value: str) -> bool:
+    if not any(c.isdigit() for c in value) or not any(c.isalpha() for c in value):
+        return False
+    if re.fullmatch(r'[0-9a-fA-F]+', value):
+        # 40 hex digits is a git commit SHA, which is routinely pinned in code
+        return len(value) >= 32 and len(value) != 40 and shannon_entropy(value) > 3.0
+    return shannon_entropy(value) > 4.0
+
+
+def _redact(value: str) -> str:
+    """Preview for reports; short values reveal only their length"""
+    if len(value) < MIN_PREVIEW_LENGTH:
+        return f"{len(value)} characters"
+    return value[:4] + "*" * 8
+
+
+def scan_secrets(code: str) -> List[SecretFinding]:
+    """Find hardcoded secrets with a literal prefilter and per-rule regex confirmation"""
+    candidates = []
+    seen = set()
+    for start, rule_index in _automaton.iter(code.translate(_ASCII_LOWER)):
+        if (start, rule_index) in seen:
+            continue
+        seen.add((start, rule_index))
+        rule = SECRET_RULES[rule_index]
+        match = rule.pattern.match(code, start)
+        if not match:
+            continue
+        if rule.entropy and not _looks_random(match.group(2)):
+            continue
+        candidates.append((match.start(), rule_index, match))
+
+    # Specific rules claim their span first so generic rules do not shadow them
+    accepted = []
+    for start, rule_index, match in sorted(candidates, key=lambda c: (c[1], c[0])):
+        position = bisect_right(accepted, (start, match.end()))
+        if position and accepted[position - 1][1] > start:
+            continue
+        if position < len(accepted) and accepted[position][0] < match.end():
+            continue
+        accepted.insert(position, (start, match.end(), rule_index, match))
+
+    line_starts = [0] + [m.end() for m in re.finditer('\n', code)] if accepted else []
+    findings = []
+    for start, end, rule_index, match in accepted:
+        findings.append(SecretFinding(
+            rule=SECRET_RULES[rule_index].name,
+            start=start,
+            end=end,
+            line=bisect_right(line_starts, start),
+            preview=_redact(match.group(match.lastindex or 0)),
+        ))
+    return findings
@@ -0,0 +1,96 @@
+import asyncio
+import time
+
+import pytest
+
+from admission import AdmissionController, AdmissionRejected, DeadlineExceeded, RequestContext, Ticket
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_full_queue_is_rejected_with_retry_after():
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1, queue_limits={"high": 1, "normal": 1, "low": 0})
+        deadline = time.monotonic() + 5
+        ticket = await controller.acquire("normal", deadline)
+        queued = asyncio.ensure_future(controller.acquire("normal", deadline))
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire("normal", deadline)
+        assert rejected.value.retry_after >= 1
+        with pytest.raises(AdmissionRejected):
+            await controller.acquire("low", deadline)
+
+        ticket.release()
+        (await queued).release()
+        assert controller.running == 0
+
+    run(scenario())
+
+
+def test_higher_priority_is_granted_first():
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1)
+        deadline = time.monotonic() + 5
+        ticket = await controller.acquire("normal", deadline)
+        low = asyncio.ensure_future(controller.acquire("low", deadline))
+        high = asyncio.ensure_future(controller.acquire("high", deadline))
+        await asyncio.sleep(0.01)
+
+        ticket.release()
+        await asyncio.sleep(0.01)
+        assert high.done() and not low.done()
+        (await high).release()
+        (await low).release()
+
+    run(scenario())
+
+
+def test_expired_waiters_are_not_granted():
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1)
+        ticket = await controller.acquire("normal", time.monotonic() + 5)
+        expiring = asyncio.ensure_future(controller.acquire("normal", time.monotonic() + 0.05))
+        await asyncio.sleep(0.01)
+
+        # Let the deadline pass without giving the event loop a chance to time the waiter out
+        time.sleep(0.1)
+        ticket.release()
+        assert controller.running == 0
+        with pytest.raises(DeadlineExceeded):
+            await expiring
+
+    run(scenario())
+
+
+def test_slot_granted_to_an_abandoned_waiter_is_returned():
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1)
+        controller.running = 1
+        waiter = asyncio.get_running_loop().create_future()
+        waiter.set_result(Ticket(controller))
+        AdmissionController._abandon(waiter)
+        assert controller.running == 0
+
+    run(scenario())
+
+
+def test_retry_after_follows_measured_service_time():
+    controller = AdmissionController(max_concurrency=2, initial_service_time=2.0, smoothing=0.5)
+    controller.running = 2
+    assert controller.retry_after() == 2
+
+    controller._release(4.0)
+    assert controller.service_time == 3.0
+    controller._release(None)
+    assert controller.service_time == 3.0
+    assert controller.running == 0
+
+
+def test_request_context_checks_deadline():
+    with pytest.raises(DeadlineExceeded):
+        RequestContext(time.monotonic() - 1).check()
+    RequestContext(time.monotonic() + 5).check()
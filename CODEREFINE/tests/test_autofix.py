@@ -0,0 +1,93 @@
+from types import SimpleNamespace
+
+from autofix import FIX_LONG_LINES, FIX_VAR, apply_local_fixes, tokenize
+
+
+VAR_ISSUE = [SimpleNamespace(title=FIX_VAR)]
+
+
+def fix_var(code):
+    return apply_local_fixes(code, 'javascript', VAR_ISSUE)
+
+
+def test_block_scoped_var_is_rewritten():
+    code = "function total(items) {\n  var sum = 0;\n  items.forEach(x => { sum += x; });\n  return sum;\n}\n"
+    fixed, resolved = fix_var(code)
+    assert "let sum = 0;" in fixed
+    assert resolved == [FIX_VAR]
+
+
+def test_var_read_after_its_block_is_kept():
+    code = "function f(flag) {\n  if (flag) {\n    var x = 1;\n  }\n  return x;\n}\n"
+    fixed, resolved = fix_var(code)
+    assert fixed == code
+    assert resolved == []
+
+
+def test_use_before_declaration_is_kept():
+    code = "console.log(x);\nvar x = 1;\n"
+    assert fix_var(code) == (code, [])
+
+
+def test_redeclared_var_is_kept():
+    code = "var a = 1;\nvar a = 2;\n"
+    assert fix_var(code) == (code, [])
+
+
+def test_loop_variables_captured_by_closures_are_kept():
+    code = "var fns = [];\nfor (var i = 0; i < 3; i++) {\n  fns.push(() => i);\n}\n"
+    fixed, resolved = fix_var(code)
+    assert fixed.startswith("let fns = [];\nfor (var i = 0;")
+    assert resolved == []
+
+
+def test_hoisted_function_reading_the_name_is_kept():
+    code = "report();\nvar level = 3;\nfunction report() { return level; }\n"
+    assert fix_var(code) == (code, [])
+
+
+def test_regex_literal_does_not_hide_later_declarations():
+    code = "var re = /'/;\nvar z = 3;\n"
+    assert [kind for kind, _ in tokenize(code, 'javascript') if kind == 'regex'] == ['regex']
+    fixed, resolved = fix_var(code)
+    assert fixed == "let re = /'/;\nlet z = 3;\n"
+    assert resolved == [FIX_VAR]
+
+
+def test_division_is_not_a_regex_literal():
+    tokens = list(tokenize("var r = (a) / b / c;\n", 'javascript'))
+    assert 'regex' not in [kind for kind, _ in tokens]
+
+
+def test_division_after_a_number_does_not_hide_uses():
+    code = "console.log(10 / x / 2);\nvar x = 1;\n"
+    assert fix_var(code) == (code, [])
+
+
+def test_division_after_a_number_does_not_hide_declarations():
+    code = "let half = 10 / 2; var total = count / 3;\n"
+    fixed, resolved = fix_var(code)
+    assert fixed == "let half = 10 / 2; let total = count / 3;\n"
+    assert resolved == [FIX_VAR]
+
+
+LONG_LINE_ISSUE = [SimpleNamespace(title=FIX_LONG_LINES)]
+ARGS = ", ".join(f"argument_{n}" for n in range(12))
+
+
+def test_long_call_is_wrapped_after_a_comma():
+    code = f"int main() {{\n    call({ARGS});\n}}\n"
+    fixed, resolved = apply_local_fixes(code, 'c', LONG_LINE_ISSUE)
+    assert all(len(line) <= 120 for line in fixed.split("\n"))
+    assert fixed.replace("\n        ", " ") == code
+    assert resolved == [FIX_LONG_LINES]
+
+
+def test_preprocessor_directives_are_not_wrapped():
+    code = f"#define CHECK_ALL(a, b, ...) \\\n    check({ARGS})\nint x;\n"
+    assert apply_local_fixes(code, 'cpp', LONG_LINE_ISSUE) == (code, [])
+
+
+def test_languages_without_known_comments_are_not_wrapped():
+    code = f"-- see also: call({ARGS})\nSELECT 1;\n"
+    assert apply_local_fixes(code, 'unknown', LONG_LINE_ISSUE) == (code, [])
@@ -0,0 +1,70 @@
+import random
+import subprocess
+
+import pytest
+
+from code_diff import complexity_reduction, diff_lines, edit_list, split_lines, unified_diff
+
+
+def test_split_lines_breaks_only_on_newlines():
+    assert split_lines("a\x0cb\nc d\r\ne") == ["a\x0cb\n", "c d\r\n", "e"]
+    assert split_lines("a\n") == ["a\n"]
+    assert split_lines("") == []
+
+
+def test_edit_line_numbers_ignore_form_feeds():
+    original = split_lines("one\ntwo\x0c\nthree\nfour\n")
+    optimized = split_lines("one\ntwo\x0c\nthree\nFOUR\n")
+    assert edit_list(optimized, diff_lines(original, optimized)) == [
+        {"start_line": 4, "removed_lines": 1, "replacement": "FOUR\n"}
+    ]
+
+
+def apply_edits(original, edits):
+    lines = list(original)
+    for edit in reversed(edits):
+        start = edit["start_line"] - 1
+        lines[start:start + edit["removed_lines"]] = split_lines(edit["replacement"])
+    return "".join(lines)
+
+
+def random_text(rng, size):
+    return "".join(rng.choice("abcde") + "\n" for _ in range(size))
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_edits_round_trip_to_the_optimized_text(seed):
+    rng = random.Random(seed)
+    original = split_lines(random_text(rng, rng.randrange(0, 30)))
+    optimized = split_lines(random_text(rng, rng.randrange(0, 30)))
+
+    opcodes = diff_lines(original, optimized)
+    assert apply_edits(original, edit_list(optimized, opcodes)) == "".join(optimized)
+    assert sum(op.i2 - op.i1 for op in opcodes if op.tag == 'equal') == sum(
+        op.j2 - op.j1 for op in opcodes if op.tag == 'equal')
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_unified_diff_applies_with_patch(tmp_path, seed):
+    rng = random.Random(seed)
+    original = random_text(rng, 40)
+    optimized = random_text(rng, 35) + "tail"
+    a, b = split_lines(original), split_lines(optimized)
+
+    target = tmp_path / "code.txt"
+    target.write_bytes(original.encode())
+    diff = unified_diff(a, b, diff_lines(a, b))
+    subprocess.run(["patch", "-s", str(target)], input=diff.encode(), check=True)
+    assert target.read_bytes().decode() == optimized
+
+
+def test_unified_diff_is_empty_without_changes():
+    lines = split_lines("same\nlines\n")
+    assert unified_diff(lines, lines, diff_lines(lines, lines)) == ""
+
+
+def test_complexity_reduction_counts_removed_branches():
+    original = split_lines("if a and b:\n    run()\nelse:\n    stop()\n")
+    optimized = split_lines("run() if a else stop()\n")
+    assert complexity_reduction(original, optimized, diff_lines(original, optimized)) == "66.7%"
+    assert complexity_reduction([], optimized, diff_lines([], optimized)) == "0%"
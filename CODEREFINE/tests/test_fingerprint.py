@@ -0,0 +1,93 @@
+from code_diff import split_lines
+from fingerprint import FingerprintIndex, line_hashes, normalize_tokens, splice_results, winnow
+
+
+BLOCK = '''def compute_totals(items, tax):
+    total = 0
+    for item in items:
+        if item.price > 0:
+            total += item.price * item.qty
+        else:
+            total -= item.discount
+    subtotal = total * (1 + tax)
+    return round(subtotal, 2)
+'''
+
+
+def fingerprints(code):
+    return winnow(normalize_tokens(code, 'python'))
+
+
+def test_internal_and_cross_submission_regions_on_same_lines_sort():
+    index = FingerprintIndex()
+    first = BLOCK + "\n\nprint('done')\n"
+    index.add('first', fingerprints(first))
+
+    second = BLOCK + "\n\nprint('again')\n" + BLOCK
+    regions = index.find_duplicates('second', fingerprints(second))
+
+    assert any(r.other_document is None for r in regions)
+    assert any(r.other_document == 'first' for r in regions)
+
+
+def test_repeated_copies_pair_with_the_matching_lines():
+    code = "import os\n\n" + BLOCK + "\n\n" + BLOCK + "\n\nprint(1)\n" + BLOCK
+    regions = FingerprintIndex().find_duplicates('doc', fingerprints(code))
+
+    assert [(r.start_line, r.end_line, r.other_start_line, r.other_end_line) for r in regions] == [
+        (14, 22, 3, 11),
+        (26, 34, 14, 22),
+    ]
+
+
+def test_run_of_identical_lines_is_not_a_duplicate_block():
+    code = "def f(x):\n" + "    x = x + 1\n" * 10 + "    return x\n"
+    assert FingerprintIndex().find_duplicates('doc', fingerprints(code)) == []
+
+
+def reviewed(code, optimized, edits):
+    lines = split_lines(code)
+    return {"optimized_code": optimized, "line_hashes": line_hashes(lines), "edits": edits}
+
+
+def test_earlier_edits_are_spliced_into_matching_lines():
+    earlier = "import os\n\n" + BLOCK
+    optimized = earlier.replace("    total = 0\n", "    total = 0.0\n")
+    index = FingerprintIndex()
+    index.add('earlier', fingerprints(earlier))
+    results = {'earlier': reviewed(earlier, optimized, [['replace', 3, 4, 3, 4]])}
+
+    code = BLOCK + "\n"
+    regions = index.find_duplicates('code', fingerprints(code))
+    spliced = splice_results(split_lines(code), regions, results)
+
+    assert spliced == (BLOCK.replace("    total = 0\n", "    total = 0.0\n") + "\n", ['earlier'])
+
+
+def test_new_lines_are_not_spliced():
+    earlier = BLOCK
+    index = FingerprintIndex()
+    index.add('earlier', fingerprints(earlier))
+    results = {'earlier': reviewed(earlier, earlier, [])}
+
+    code = BLOCK + "print(compute_totals([], 0))\n"
+    regions = index.find_duplicates('code', fingerprints(code))
+    assert splice_results(split_lines(code), regions, results) is None
+
+
+def test_stored_results_are_bounded_by_size(tmp_path):
+    index = FingerprintIndex(max_result_bytes=2500)
+    for n in range(5):
+        index.add(f'doc{n}', [])
+        index.store_result(f'doc{n}', {"optimized_code": "x" * 1000})
+
+    assert [index.get_result(f'doc{n}') is not None for n in range(5)] == [False, False, False, True, True]
+
+    index.store_result('doc0', {"optimized_code": "x" * 5000})
+    assert index.get_result('doc0') is None
+
+    path = str(tmp_path / "index.json.gz")
+    index.save(path)
+    loaded = FingerprintIndex.load(path)
+    assert loaded.max_result_bytes == 2500
+    assert loaded.get_result('doc4') == {"optimized_code": "x" * 1000}
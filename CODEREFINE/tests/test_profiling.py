@@ -0,0 +1,62 @@
+import pstats
+import re
+import time
+
+import pytest
+
+from profiling import MAX_STORED_PROFILES, Profiler
+
+
+def busy(n):
+    deadline = time.perf_counter() + 0.05
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(n))
+    return total
+
+
+def test_unprofiled_run_returns_the_result_only():
+    assert Profiler().run(None, busy, 10)[1] is None
+
+
+def test_pstats_profile_loads(tmp_path):
+    profiler = Profiler()
+    result, profile_id = profiler.run("pstats", busy, 10)
+    assert result > 0
+
+    captured = profiler.get(profile_id)
+    path = tmp_path / "review.pstats"
+    path.write_bytes(captured.data)
+    stats = pstats.Stats(str(path))
+    assert any(function == "busy" for _, _, function in stats.stats)
+
+
+def test_collapsed_profile_has_one_stack_per_line():
+    profiler = Profiler()
+    _, profile_id = profiler.run("collapsed", busy, 10)
+
+    lines = profiler.get(profile_id).data.decode("utf-8").splitlines()
+    assert lines
+    assert all(re.fullmatch(r"\S.* \d+", line) for line in lines)
+    assert any("busy (test_profiling.py:" in line for line in lines)
+
+
+def test_choose_prefers_the_request_header():
+    profiler = Profiler()
+    assert profiler.choose() is None
+    assert profiler.choose("pstats") == "pstats"
+    assert profiler.choose("flamegraph") == "collapsed"
+
+    profiler.configure(1.0, "pstats")
+    assert profiler.choose() == "pstats"
+    with pytest.raises(ValueError):
+        profiler.configure(2.0, "pstats")
+    with pytest.raises(ValueError):
+        profiler.configure(0.5, "svg")
+
+
+def test_stored_profiles_are_bounded():
+    profiler = Profiler()
+    ids = [profiler.run("collapsed", int)[1] for _ in range(MAX_STORED_PROFILES + 1)]
+    assert profiler.get(ids[0]) is None
+    assert [p["id"] for p in profiler.list()][0] == ids[-1]
@@ -0,0 +1,37 @@
+import pytest
+
+from secret_scanner import scan_secrets
+
+
+@pytest.mark.parametrize("code", [
+    'tokenizer = "bert-base-uncased"',
+    'secretary = "Alice"',
+    'token_type = "bearer"',
+    'pwd = "/home/user"',
+    'TOKENIZER_PATH = "models/tok.json"',
+    'PINNED_COMMIT = "3f786850e387550fdab836ed7e6dc881de23001b"',
+])
+def test_ordinary_assignments_are_not_secrets(code):
+    assert scan_secrets(code) == []
+
+
+@pytest.mark.parametrize("code", [
+    'password = "hunter22"',
+    'DB_PASSWORD = "s3cr3t!!"',
+    'SECRET_KEY = "abcd1234xyz"',
+    '{"api-key": "zzzz9999"}',
+    'client_secret: "abcdefgh"',
+])
+def test_credential_assignments_are_found(code):
+    assert [f.rule for f in scan_secrets(code)] == ["Hardcoded Credential"]
+
+
+def test_short_secrets_are_not_revealed_in_previews():
+    [finding] = scan_secrets('password = "abcd"')
+    assert "abcd" not in finding.preview
+    assert finding.preview == "4 characters"
+
+
+def test_long_secrets_show_only_a_short_prefix():
+    [finding] = scan_secrets('token = "Zq81mXp2Lr0vNc7Ty4Hs"')
+    assert finding.preview == "Zq81********"
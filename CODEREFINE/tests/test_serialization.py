@@ -0,0 +1,51 @@
+import gzip
+import json
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+import serialization
+from serialization import MIN_COMPRESS_SIZE, dumps, json_response, negotiate_encoding
+
+
+BEST = "br" if serialization.brotli is not None else "gzip"
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("", None),
+    ("identity", None),
+    ("gzip", "gzip"),
+    ("gzip;q=0", None),
+    ("GZIP; q=0.5, deflate", "gzip"),
+    ("gzip;q=0.5, br;q=0.9", BEST),
+    ("br;q=0.1, gzip;q=0.8", "gzip"),
+    ("*;q=0.3", BEST),
+    ("*, gzip;q=0", "br" if BEST == "br" else None),
+    ("gzip;q=oops", None),
+])
+def test_negotiate_encoding_respects_q_values(header, expected):
+    assert negotiate_encoding(header) == expected
+
+
+def test_dumps_is_compact_utf8():
+    assert dumps({"a": [1, "é"]}) == '{"a":[1,"é"]}'.encode("utf-8")
+
+
+def test_small_bodies_are_not_compressed():
+    response = json_response({"ok": True}, accept_encoding="gzip")
+    assert response.body == b'{"ok":true}'
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+
+
+def test_large_bodies_are_compressed_when_accepted():
+    payload = {"code": "x" * MIN_COMPRESS_SIZE}
+    response = json_response(payload, accept_encoding="gzip", status_code=201)
+    assert response.status_code == 201
+    assert response.headers["content-encoding"] == "gzip"
+    assert json.loads(gzip.decompress(response.body)) == payload
+
+    plain = json_response(payload)
+    assert "content-encoding" not in plain.headers
+    assert json.loads(plain.body) == payload